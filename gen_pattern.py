@@ -5,15 +5,48 @@ A GUI tool for generating and previewing camera calibration patterns.
 """
 
 import argparse
+import functools
+import os
 import numpy as np
 import json
 import gzip
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk
 import io
 import cairosvg
-import svgwrite
+
+
+def _f(v):
+    # Three decimals are visually exact and keep the SVG far smaller than float reprs
+    s = f"{v:.3f}".rstrip("0").rstrip(".")
+    return "0" if s == "-0" else s
+
+
+@functools.lru_cache(maxsize=4)
+def _load_aruco_dict(path, mtime):
+    # Returns all markers as a read-only uint8 array of shape (nmarkers, N+2, N+2),
+    # each with a zero border. mtime is only part of the cache key, so editing
+    # the file invalidates the entry
+    if path.split(".")[-1] == "gz":
+        with gzip.open(path, 'rb') as fin:
+            dictionary = json.loads(fin.read())
+    else:
+        with open(path, 'rb') as f:
+            dictionary = json.loads(f.read())
+
+    markerSize_bits = dictionary["markersize"]
+    byteLists = [dictionary["marker_" + str(i)] for i in range(dictionary["nmarkers"])]
+    if all(isinstance(byteList, str) for byteList in byteLists):
+        # Markers are stored as strings of '0'/'1' characters; decode them all in one pass
+        bits = np.frombuffer("".join(byteLists).encode("ascii"), dtype=np.uint8) - ord("0")
+    else:
+        bits = np.asarray(byteLists, dtype=np.uint8)
+    markers = np.zeros((len(byteLists), markerSize_bits+2, markerSize_bits+2), dtype=np.uint8)
+    markers[:, 1:markerSize_bits+1, 1:markerSize_bits+1] = bits.reshape(-1, markerSize_bits, markerSize_bits)
+    markers.flags.writeable = False  # Shared between all boards built from this file
+    return markers
 
 
 class PatternMaker:
@@ -29,13 +62,36 @@ class PatternMaker:
         self.width = page_width
         self.height = page_height
         self.markers = markers
+        # Marker cells are also kept as parallel column/row index arrays for vectorized placement
+        self.markers_x = self.markers_y = None
+        if markers is not None:
+            marker_cells = np.asarray(markers, dtype=np.int32).reshape(-1, 2)
+            self.markers_x = marker_cells[:, 0]
+            self.markers_y = marker_cells[:, 1]
         self.aruco_marker_size = aruco_marker_size
         self.dict_file = dict_file
 
-        # Initialize an SVG drawing with svgwrite
-        self.dwg = svgwrite.Drawing(filename=output, size=(f"{self.width}{self.units}", f"{self.height}{self.units}"),
-                                    viewBox=f"0 0 {self.width} {self.height}")
-        self.g = self.dwg.g()  # Create a group to hold all elements
+        # SVG elements are written straight into a list of ASCII byte strings;
+        # building svgwrite element objects per shape dominated runtime on dense
+        # patterns, and keeping bytes avoids re-encoding the whole document
+        self._buf = []
+
+    def _emit_circle(self, cx, cy, r, fill="black"):
+        self._buf.append(f'<circle cx="{_f(cx)}" cy="{_f(cy)}" r="{_f(r)}" fill="{fill}"/>'.encode())
+
+    def _emit_circles(self, centers, r, fill="black"):
+        # Writes circles at (cx, cy) string pairs already formatted with _f, unlike _emit_rects
+        # which formats numeric arrays itself
+        tail = f'" r="{_f(r)}" fill="{fill}"/>'
+        self._buf.extend(f'<circle cx="{cx}" cy="{cy}{tail}'.encode() for cx, cy in centers)
+
+    def _emit_rects(self, xs, ys, width, height, fill="black", extra=""):
+        # Writes equally sized rects at numeric coordinate arrays
+        tail = f' width="{_f(width)}" height="{_f(height)}" fill="{fill}"{extra}/>'
+        self._buf.extend(f'<rect x="{_f(x)}" y="{_f(y)}"{tail}'.encode() for x, y in zip(xs.tolist(), ys.tolist()))
+
+    def _emit_path(self, d, fill="black"):
+        self._buf.append(f'<path d="{d}" fill="{fill}"/>'.encode())
 
     def make_circles_pattern(self):
         spacing = self.square_size
@@ -44,15 +100,10 @@ class PatternMaker:
         pattern_height = ((self.rows - 1.0) * spacing) + (2.0 * r)
         x_spacing = (self.width - pattern_width) / 2.0
         y_spacing = (self.height - pattern_height) / 2.0
-        for x in range(0, self.cols):
-            for y in range(0, self.rows):
-                dot = self.dwg.circle(
-                    center=((x * spacing) + x_spacing + r, (y * spacing) + y_spacing + r),
-                    r=r,
-                    fill="black",
-                    stroke="none"
-                )
-                self.g.add(dot)
+        # Each column/row coordinate is formatted once and reused for every circle on it
+        cx = [_f(v) for v in (np.arange(self.cols) * spacing + x_spacing + r).tolist()]
+        cy = [_f(v) for v in (np.arange(self.rows) * spacing + y_spacing + r).tolist()]
+        self._emit_circles(((x, y) for x in cx for y in cy), r)
 
     def make_acircles_pattern(self):
         spacing = self.square_size
@@ -61,44 +112,54 @@ class PatternMaker:
         pattern_height = ((self.rows-1.0) * spacing) + (2.0 * r)
         x_spacing = (self.width - pattern_width) / 2.0
         y_spacing = (self.height - pattern_height) / 2.0
-        for x in range(0, self.cols):
-            for y in range(0, self.rows):
-                dot = self.dwg.circle(
-                    center=((2 * x * spacing) + (y % 2)*spacing + x_spacing + r, (y * spacing) + y_spacing + r),
-                    r=r,
-                    fill="black",
-                    stroke="none"
-                )
-                self.g.add(dot)
-
-    def make_checkerboard_pattern(self):
-        spacing = self.square_size
+        # Odd rows are shifted by one spacing, so there is one column table per row parity
+        cx = 2 * np.arange(self.cols) * spacing + x_spacing + r
+        cx_by_parity = ([_f(v) for v in cx.tolist()], [_f(v) for v in (cx + spacing).tolist()])
+        cy = [_f(v) for v in (np.arange(self.rows) * spacing + y_spacing + r).tolist()]
+        self._emit_circles(((cx_by_parity[y % 2][x], cy[y])
+                            for x in range(self.cols) for y in range(self.rows)), r)
+
+    def _black_cells(self):
+        # Column/row indices of all cells with x % 2 == y % 2, in column-major order
+        ix, iy = np.indices((self.cols, self.rows))
+        mask = (ix & 1) == (iy & 1)
+        return ix[mask], iy[mask]
+
+    def _cell_offsets(self):
+        # Left edge of every column and top edge of every row of the centred square grid
         xspacing = (self.width - self.cols * self.square_size) / 2.0
         yspacing = (self.height - self.rows * self.square_size) / 2.0
-        for x in range(0, self.cols):
-            for y in range(0, self.rows):
-                if x % 2 == y % 2:
-                    square = self.dwg.rect(
-                        insert=(x * spacing + xspacing, y * spacing + yspacing),
-                        size=(spacing, spacing),
-                        fill="black",
-                        stroke="none"
-                    )
-                    self.g.add(square)
+        return ((np.arange(self.cols) * self.square_size + xspacing).tolist(),
+                (np.arange(self.rows) * self.square_size + yspacing).tolist())
+
+    def make_checkerboard_pattern(self):
+        x_px, y_px = self._cell_offsets()
+        x_str = [_f(v) for v in x_px]
+        y_str = [_f(v) for v in y_px]
+        xs, ys = self._black_cells()
+        # All squares share one fill, so they go into a single path of M..z subpaths
+        tail = self._square_tail(self.square_size)
+        self._emit_path("".join(f"M{x_str[x]} {y_str[y]}{tail}" for x, y in zip(xs.tolist(), ys.tolist())))
+
+    @staticmethod
+    def _square_tail(size):
+        # Relative moves drawing a square from its top-left corner, to follow an M command
+        return f"h{_f(size)}v{_f(size)}h{_f(-size)}z"
 
     @staticmethod
     def _make_round_rect(x, y, diam, corners=("right", "right", "right", "right")):
         rad = diam / 2
-        path = ["M{},{}".format(x + rad, y)]  # Start at top-left (adjusted for radius)
+        path = ["M{},{}".format(_f(x + rad), _f(y))]  # Start at top-left (adjusted for radius)
         cw_point = ((0, 0), (diam, 0), (diam, diam), (0, diam))
         mid_cw_point = ((0, rad), (rad, 0), (diam, rad), (rad, diam))
         n = len(cw_point)
         for i in range(n):
             if corners[i] == "right":
-                path.append("L{},{}".format(x + cw_point[i][0], y + cw_point[i][1]))
-                path.append("L{},{}".format(x + mid_cw_point[(i + 1) % n][0], y + mid_cw_point[(i + 1) % n][1]))
+                path.append("L{},{}".format(_f(x + cw_point[i][0]), _f(y + cw_point[i][1])))
+                path.append("L{},{}".format(_f(x + mid_cw_point[(i + 1) % n][0]), _f(y + mid_cw_point[(i + 1) % n][1])))
             elif corners[i] == "round":
-                path.append("A{},{} 0 0 1 {},{}".format(rad, rad, x + mid_cw_point[(i + 1) % n][0], y + mid_cw_point[(i + 1) % n][1]))
+                path.append("A{},{} 0 0 1 {},{}".format(_f(rad), _f(rad), _f(x + mid_cw_point[(i + 1) % n][0]),
+                                                        _f(y + mid_cw_point[(i + 1) % n][1])))
             else:
                 raise TypeError("unknown corner type")
         path.append("Z")  # Close the path
@@ -127,126 +188,149 @@ class PatternMaker:
 
     def make_radon_checkerboard_pattern(self):
         spacing = self.square_size
-        xspacing = (self.width - self.cols * self.square_size) / 2.0
-        yspacing = (self.height - self.rows * self.square_size) / 2.0
-        for x in range(0, self.cols):
-            for y in range(0, self.rows):
-                if x % 2 == y % 2:
-                    corner_types, is_inside = self._get_type(x, y)
-                    if is_inside:
-                        square = self.dwg.rect(
-                            insert=(x * spacing + xspacing, y * spacing + yspacing),
-                            size=(spacing, spacing),
-                            fill="black",
-                            stroke="none"
-                        )
-                    else:
-                        square = self.dwg.path(
-                            d=self._make_round_rect(x * spacing + xspacing, y * spacing + yspacing, spacing, corner_types),
-                            fill="black",
-                            stroke="none"
-                        )
-                    self.g.add(square)
+        x_px, y_px = self._cell_offsets()
+        x_str = [_f(v) for v in x_px]
+        y_str = [_f(v) for v in y_px]
+        tail = self._square_tail(spacing)
+        xs, ys = self._black_cells()
+        inside_parts = []
+        boundary_parts = []
+        get_type = self._get_type
+        make_round_rect = self._make_round_rect
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            corner_types, is_inside = get_type(x, y)
+            if is_inside:
+                inside_parts.append(f"M{x_str[x]} {y_str[y]}{tail}")
+            else:
+                boundary_parts.append(make_round_rect(x_px[x], y_px[y], spacing, corner_types))
+        if inside_parts:
+            self._emit_path("".join(inside_parts))
+        if boundary_parts:
+            self._emit_path(" ".join(boundary_parts))
         if self.markers is not None:
             r = self.square_size * 0.17
             pattern_width = ((self.cols - 1.0) * spacing) + (2.0 * r)
             pattern_height = ((self.rows - 1.0) * spacing) + (2.0 * r)
             x_spacing = (self.width - pattern_width) / 2.0
             y_spacing = (self.height - pattern_height) / 2.0
-            for x, y in self.markers:
-                color = "black"
-                if x % 2 == y % 2:
-                    color = "white"
-                dot = self.dwg.circle(
-                    center=((x * spacing) + x_spacing + r, (y * spacing) + y_spacing + r),
-                    r=r,
-                    fill=color,
-                    stroke="none"
-                )
-                self.g.add(dot)
-
-    @staticmethod
-    def _create_marker_bits(markerSize_bits, byteList):
-        marker = np.zeros((markerSize_bits+2, markerSize_bits+2))
-        bits = marker[1:markerSize_bits+1, 1:markerSize_bits+1]
-        for i in range(markerSize_bits):
-            for j in range(markerSize_bits):
-                bits[i][j] = int(byteList[i*markerSize_bits+j])
-        return marker
+            cx = self.markers_x * spacing + x_spacing + r
+            cy = self.markers_y * spacing + y_spacing + r
+            # Markers on black squares are white and vice versa
+            on_black = (self.markers_x & 1) == (self.markers_y & 1)
+            for x, y, white in zip(cx.tolist(), cy.tolist(), on_black.tolist()):
+                self._emit_circle(x, y, r, "white" if white else "black")
 
     def make_charuco_board(self):
         if self.aruco_marker_size > self.square_size:
-            print("Error: Aruco marker cannot be larger than chessboard square!")
-            return
+            raise ValueError("Aruco marker cannot be larger than chessboard square!")
 
-        if self.dict_file.split(".")[-1] == "gz":
-            with gzip.open(self.dict_file, 'r') as fin:
-                json_bytes = fin.read()
-                json_str = json_bytes.decode('utf-8')
-                dictionary = json.loads(json_str)
-        else:
-            with open(self.dict_file) as f:
-                dictionary = json.load(f)
+        marker_bits = _load_aruco_dict(self.dict_file, os.path.getmtime(self.dict_file))
 
-        if dictionary["nmarkers"] < int(self.cols * self.rows / 2):
-            print("Error: Aruco dictionary contains fewer markers than needed for the chosen board.")
-            return
+        if len(marker_bits) < int(self.cols * self.rows / 2):
+            raise ValueError("Aruco dictionary contains fewer markers than needed for the chosen board.")
 
-        markerSize_bits = dictionary["markersize"]
+        markerSize_bits = marker_bits.shape[1] - 2
         side = self.aruco_marker_size / (markerSize_bits + 2)
         spacing = self.square_size
         xspacing = (self.width - self.cols * self.square_size) / 2.0
         yspacing = (self.height - self.rows * self.square_size) / 2.0
         ch_ar_border = (self.square_size - self.aruco_marker_size) / 2
-        if ch_ar_border < side * 0.7:
-            print(f"Marker border {ch_ar_border} is less than 70% of ArUco pin size {int(side)}")
-        marker_id = 0
-        for y in range(0, self.rows):
-            for x in range(0, self.cols):
-                if x % 2 == y % 2:
-                    square = self.dwg.rect(
-                        insert=(x * spacing + xspacing, y * spacing + yspacing),
-                        size=(spacing, spacing),
-                        fill="black",
-                        stroke="none"
-                    )
-                    self.g.add(square)
-                else:
-                    img_mark = self._create_marker_bits(markerSize_bits, dictionary["marker_" + str(marker_id)])
-                    marker_id += 1
-                    x_pos = x * spacing + xspacing
-                    y_pos = y * spacing + yspacing
-                    square = self.dwg.rect(
-                        insert=(x_pos + ch_ar_border, y_pos + ch_ar_border),
-                        size=(self.aruco_marker_size, self.aruco_marker_size),
-                        fill="black",
-                        stroke="none"
-                    )
-                    self.g.add(square)
-                    for x_ in range(len(img_mark[0])):
-                        for y_ in range(len(img_mark)):
-                            if img_mark[y_][x_] != 0:
-                                square = self.dwg.rect(
-                                    insert=(x_pos + ch_ar_border + (x_ * side), y_pos + ch_ar_border + (y_ * side)),
-                                    size=(side, side),
-                                    fill="white",
-                                    stroke="white",
-                                    stroke_width=spacing * 0.01
-                                )
-                                self.g.add(square)
+        bit_stroke = f' stroke="white" stroke-width="{_f(spacing * 0.01)}"'
+        x_px = np.arange(self.cols) * spacing + xspacing
+        y_px = np.arange(self.rows) * spacing + yspacing
+        iy, ix = np.indices((self.rows, self.cols))
+        is_black = (ix & 1) == (iy & 1)
+        self._emit_rects(x_px[ix[is_black]], y_px[iy[is_black]], spacing, spacing)
+
+        # Marker ids are assigned to the remaining cells in row-major order; all
+        # backgrounds go first so that every marker's white bits are drawn on top
+        marker_x = x_px[ix[~is_black]] + ch_ar_border
+        marker_y = y_px[iy[~is_black]] + ch_ar_border
+        self._emit_rects(marker_x, marker_y, self.aruco_marker_size, self.aruco_marker_size)
+        marker_id, bit_y, bit_x = np.nonzero(marker_bits[:len(marker_x)])
+        self._emit_rects(marker_x[marker_id] + bit_x * side, marker_y[marker_id] + bit_y * side,
+                         side, side, "white", bit_stroke)
+
+    def make_pattern(self, pattern_type):
+        # Builds with identical parameters (e.g. preview, then save) share one cached SVG body
+        markers = None
+        if self.markers is not None:
+            markers = tuple(zip(self.markers_x.tolist(), self.markers_y.tolist()))
+        dict_file = dict_mtime = None
+        if pattern_type == "charuco_board":
+            # Other patterns ignore the dictionary, so it stays out of their cache key
+            dict_file = self.dict_file
+            dict_mtime = os.path.getmtime(dict_file)
+            # Checked outside the cached build so that every build reports it
+            if self.aruco_marker_size <= self.square_size:
+                markerSize_bits = _load_aruco_dict(dict_file, dict_mtime).shape[1] - 2
+                side = self.aruco_marker_size / (markerSize_bits + 2)
+                ch_ar_border = (self.square_size - self.aruco_marker_size) / 2
+                if ch_ar_border < side * 0.7:
+                    print(f"Marker border {ch_ar_border} is less than 70% of ArUco pin size {int(side)}")
+        self._buf.append(_build_svg_body(pattern_type, self.cols, self.rows, self.square_size, self.radius_rate,
+                                         self.width, self.height, markers, self.aruco_marker_size,
+                                         dict_file, dict_mtime))
+
+    def _make_pattern_uncached(self, pattern_type):
+        pattern_methods = {
+            "circles": self.make_circles_pattern,
+            "acircles": self.make_acircles_pattern,
+            "checkerboard": self.make_checkerboard_pattern,
+            "radon_checkerboard": self.make_radon_checkerboard_pattern,
+            "charuco_board": self.make_charuco_board
+        }
+        pattern_methods[pattern_type]()
+
+    @staticmethod
+    def _svg_header(width, height, units):
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+                f'width="{width}{units}" height="{height}{units}" '
+                f'viewBox="0 0 {width} {height}">')
+
+    def _build_body(self):
+        return b"".join(self._buf)
+
+    @staticmethod
+    def wrap(body, width, height, units):
+        # The body only depends on the pattern and page geometry, not on the units
+        return PatternMaker._svg_header(width, height, units).encode() + body + b"</svg>"
+
+    def get_svg_bytes(self):
+        return self.wrap(self._build_body(), self.width, self.height, self.units)
 
     def get_svg_string(self):
-        self.dwg.add(self.g)
-        return self.dwg.tostring()
+        return self.get_svg_bytes().decode()
 
     def save(self):
-        self.dwg.add(self.g)
-        self.dwg.save()
+        # Stream the fragments instead of joining the whole document in memory first
+        with open(self.output, "wb") as f:
+            f.write(b'<?xml version="1.0" encoding="utf-8" ?>\n')
+            f.write(self._svg_header(self.width, self.height, self.units).encode())
+            f.writelines(self._buf)
+            f.write(b"</svg>")
+
+
+@functools.lru_cache(maxsize=8)
+def _build_svg_body(pattern_type, cols, rows, square_size, radius_rate, page_width, page_height,
+                    markers, aruco_marker_size, dict_file, dict_mtime):
+    # The body does not depend on the units, and dict_mtime is only part of the cache key
+    pm = PatternMaker(cols, rows, None, "mm", square_size, radius_rate, page_width, page_height,
+                      markers, aruco_marker_size, dict_file)
+    pm._make_pattern_uncached(pattern_type)
+    return pm._build_body()
 
 
 class PatternMakerGUI:
     def __init__(self, root):
         self.img = None
+        self._pending_id = None  # Pending after() job of a debounced preview
+        self._executor = ThreadPoolExecutor(max_workers=1)  # Background preview renderer
+        self._gen_id = 0  # Incremented per preview request to discard stale renders
+        self._preview_future = None  # Future of the last submitted preview render
+        self._last_svg_hash = None  # Hash of the last rasterized (SVG, size) pair
+        self._last_png_image = None  # PIL image rendered for _last_svg_hash
+        self._shown_image = None  # PIL image currently wrapped by self.img
         self.root = root
         self.root.title("Camera Calibration Pattern Generator")
         self.root.geometry("1200x800")
@@ -376,39 +460,39 @@ class PatternMakerGUI:
                                   values=["circles", "acircles", "checkerboard", "radon_checkerboard"],
                                   state="readonly", width=20)
         type_combo.grid(row=0, column=1, sticky=tk.W+tk.E, pady=row_padding, padx=(5, 0))
-        type_combo.bind("<<ComboboxSelected>>", lambda e: self.generate_preview())
+        type_combo.bind("<<ComboboxSelected>>", lambda e: self._schedule_preview())
 
         # Rows and columns with improved layout
         ttk.Label(pattern_frame, text="Rows:").grid(row=1, column=0, sticky=tk.W, pady=row_padding)
         self.rows_var = tk.IntVar(value=self.rows)
         rows_spinbox = ttk.Spinbox(pattern_frame, from_=1, to=50, textvariable=self.rows_var, width=8)
         rows_spinbox.grid(row=1, column=1, sticky=tk.W, pady=row_padding, padx=(5, 0))
-        rows_spinbox.bind("<Return>", lambda e: self.generate_preview())
-        rows_spinbox.bind("<<Increment>>", lambda e: self.generate_preview())
-        rows_spinbox.bind("<<Decrement>>", lambda e: self.generate_preview())
+        rows_spinbox.bind("<Return>", lambda e: self._schedule_preview())
+        rows_spinbox.bind("<<Increment>>", lambda e: self._schedule_preview())
+        rows_spinbox.bind("<<Decrement>>", lambda e: self._schedule_preview())
 
         ttk.Label(pattern_frame, text="Columns:").grid(row=2, column=0, sticky=tk.W, pady=row_padding)
         self.cols_var = tk.IntVar(value=self.columns)
         cols_spinbox = ttk.Spinbox(pattern_frame, from_=1, to=50, textvariable=self.cols_var, width=8)
         cols_spinbox.grid(row=2, column=1, sticky=tk.W, pady=row_padding, padx=(5, 0))
-        cols_spinbox.bind("<Return>", lambda e: self.generate_preview())
-        cols_spinbox.bind("<<Increment>>", lambda e: self.generate_preview())
-        cols_spinbox.bind("<<Decrement>>", lambda e: self.generate_preview())
+        cols_spinbox.bind("<Return>", lambda e: self._schedule_preview())
+        cols_spinbox.bind("<<Increment>>", lambda e: self._schedule_preview())
+        cols_spinbox.bind("<<Decrement>>", lambda e: self._schedule_preview())
 
         # Square size and radius rate
         ttk.Label(pattern_frame, text="Square Size:").grid(row=3, column=0, sticky=tk.W, pady=row_padding)
         self.square_size_var = tk.DoubleVar(value=self.square_size)
         square_size_entry = ttk.Entry(pattern_frame, textvariable=self.square_size_var, width=10)
         square_size_entry.grid(row=3, column=1, sticky=tk.W, pady=row_padding, padx=(5, 0))
-        square_size_entry.bind("<Return>", lambda e: self.generate_preview())
-        square_size_entry.bind("<FocusOut>", lambda e: self.generate_preview())
+        square_size_entry.bind("<Return>", lambda e: self._schedule_preview())
+        square_size_entry.bind("<FocusOut>", lambda e: self._schedule_preview())
 
         ttk.Label(pattern_frame, text="Radius Rate:").grid(row=4, column=0, sticky=tk.W, pady=row_padding)
         self.radius_rate_var = tk.DoubleVar(value=self.radius_rate)
         radius_rate_entry = ttk.Entry(pattern_frame, textvariable=self.radius_rate_var, width=10)
         radius_rate_entry.grid(row=4, column=1, sticky=tk.W, pady=row_padding, padx=(5, 0))
-        radius_rate_entry.bind("<Return>", lambda e: self.generate_preview())
-        radius_rate_entry.bind("<FocusOut>", lambda e: self.generate_preview())
+        radius_rate_entry.bind("<Return>", lambda e: self._schedule_preview())
+        radius_rate_entry.bind("<FocusOut>", lambda e: self._schedule_preview())
 
         # ArUco marker settings in a separate subframe with a separator
         ttk.Separator(pattern_frame, orient=tk.HORIZONTAL).grid(row=5, column=0, columnspan=2, sticky=tk.E+tk.W, pady=10)
@@ -420,8 +504,8 @@ class PatternMakerGUI:
         self.marker_size_var = tk.DoubleVar(value=self.aruco_marker_size)
         marker_size_entry = ttk.Entry(pattern_frame, textvariable=self.marker_size_var, width=10)
         marker_size_entry.grid(row=7, column=1, sticky=tk.W, pady=row_padding, padx=(5, 0))
-        marker_size_entry.bind("<Return>", lambda e: self.generate_preview())
-        marker_size_entry.bind("<FocusOut>", lambda e: self.generate_preview())
+        marker_size_entry.bind("<Return>", lambda e: self._schedule_preview())
+        marker_size_entry.bind("<FocusOut>", lambda e: self._schedule_preview())
 
         # Dictionary file with improved layout
         ttk.Label(pattern_frame, text="Dictionary File:").grid(row=8, column=0, sticky=tk.W, pady=row_padding)
@@ -455,15 +539,15 @@ class PatternMakerGUI:
         self.page_width_var = tk.DoubleVar(value=self.page_width)
         self.page_width_entry = ttk.Entry(page_frame, textvariable=self.page_width_var, width=10)
         self.page_width_entry.grid(row=1, column=1, sticky=tk.W, pady=row_padding, padx=(5, 0))
-        self.page_width_entry.bind("<Return>", lambda e: self.generate_preview())
-        self.page_width_entry.bind("<FocusOut>", lambda e: self.generate_preview())
+        self.page_width_entry.bind("<Return>", lambda e: self._schedule_preview())
+        self.page_width_entry.bind("<FocusOut>", lambda e: self._schedule_preview())
 
         ttk.Label(page_frame, text="Height:").grid(row=2, column=0, sticky=tk.W, pady=row_padding)
         self.page_height_var = tk.DoubleVar(value=self.page_height)
         self.page_height_entry = ttk.Entry(page_frame, textvariable=self.page_height_var, width=10)
         self.page_height_entry.grid(row=2, column=1, sticky=tk.W, pady=row_padding, padx=(5, 0))
-        self.page_height_entry.bind("<Return>", lambda e: self.generate_preview())
-        self.page_height_entry.bind("<FocusOut>", lambda e: self.generate_preview())
+        self.page_height_entry.bind("<Return>", lambda e: self._schedule_preview())
+        self.page_height_entry.bind("<FocusOut>", lambda e: self._schedule_preview())
 
         # Units selection
         ttk.Label(page_frame, text="Units:").grid(row=3, column=0, sticky=tk.W, pady=row_padding)
@@ -472,7 +556,7 @@ class PatternMakerGUI:
                                   values=["mm", "px"],
                                   state="readonly", width=10)
         units_combo.grid(row=3, column=1, sticky=tk.W, pady=row_padding, padx=(5, 0))
-        units_combo.bind("<<ComboboxSelected>>", lambda e: self.generate_preview())
+        units_combo.bind("<<ComboboxSelected>>", lambda e: self._schedule_preview())
 
     def create_preview_canvas(self):
         preview_frame = ttk.LabelFrame(self.right_frame, text="Pattern Preview", padding=15)
@@ -522,7 +606,7 @@ class PatternMakerGUI:
         if selected != "Custom":
             self.page_width_var.set(self.page_sizes[selected][0])
             self.page_height_var.set(self.page_sizes[selected][1])
-            self.generate_preview()
+            self._schedule_preview()
 
     def browse_dict_file(self):
         filename = filedialog.askopenfilename(
@@ -531,12 +615,28 @@ class PatternMakerGUI:
         )
         if filename:
             self.dict_file_var.set(filename)
-            self.generate_preview()
+            self._schedule_preview()
+
+    def _schedule_preview(self, delay=150):
+        # Coalesce bursts of UI events into a single render
+        if self._pending_id is not None:
+            self.root.after_cancel(self._pending_id)
+        self._pending_id = self.root.after(delay, self._run_pending_preview)
+
+    def _run_pending_preview(self):
+        self._pending_id = None
+        self.generate_preview()
 
     def exit_program(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
 
     def generate_preview(self):
+        # A direct request (e.g. the Update Preview button) supersedes a debounced one
+        if self._pending_id is not None:
+            self.root.after_cancel(self._pending_id)
+            self._pending_id = None
+
         try:
             self.status_var.set("Generating preview...")
             self.root.update_idletasks()
@@ -568,65 +668,104 @@ class PatternMakerGUI:
                 dict_file=dict_file
             )
 
-            # Generate the pattern
-            pattern_methods = {
-                "circles": pm.make_circles_pattern,
-                "acircles": pm.make_acircles_pattern,
-                "checkerboard": pm.make_checkerboard_pattern,
-                "radon_checkerboard": pm.make_radon_checkerboard_pattern
-            }
-
-            if pattern_type == "charuco_board":
-                pm.make_charuco_board()
-            else:
-                pattern_methods[pattern_type]()
-
-            # Get SVG string
-            svg_str = pm.get_svg_string()
-
-            # Convert SVG to PNG in memory using cairosvg
-            png_data = cairosvg.svg2png(bytestring=svg_str.encode('utf-8'))
-
-            # Clear canvas
-            self.canvas.delete("all")
-
-            # Load image from PNG data
-            image = Image.open(io.BytesIO(png_data))
-
             # Get canvas size
             self.canvas.update()
             canvas_width = self.canvas.winfo_width()
             canvas_height = self.canvas.winfo_height()
 
-            if canvas_width > 1 and canvas_height > 1:
-                image_ratio = image.width / image.height
-                canvas_ratio = canvas_width / canvas_height
+        except Exception as e:
+            self.status_var.set(f"Error: {str(e)}")
+            messagebox.showerror("Error", f"Failed to generate preview: {str(e)}")
+            return
 
-                if image_ratio > canvas_ratio:
-                    new_width = canvas_width
-                    new_height = int(canvas_width / image_ratio)
-                else:
-                    new_height = canvas_height
-                    new_width = int(canvas_height * image_ratio)
+        # Render off the Tk main thread; results of superseded requests are dropped
+        self._gen_id += 1
+        gen_id = self._gen_id
+        # Drop the previous render if it is still queued; a running one is discarded via gen_id
+        if self._preview_future is not None:
+            self._preview_future.cancel()
+        future = self._executor.submit(self._render_preview, pm, pattern_type, canvas_width, canvas_height)
+        self._preview_future = future
+        self.root.after(10, self._show_preview, gen_id, future, pattern_type, columns, rows,
+                        canvas_width, canvas_height)
+
+    def _render_preview(self, pm, pattern_type, canvas_width, canvas_height):
+        # Runs on the executor thread, so it must not touch any Tk objects
+        # Unchanged pattern parameters hit the SVG body cache, e.g. when only the units change
+        pm.make_pattern(pattern_type)
+
+        # Get SVG document as bytes
+        svg_bytes = pm.get_svg_bytes()
+
+        # Rasterize directly at display size instead of downsampling a full-page render
+        target_size = None
+        if canvas_width > 1 and canvas_height > 1:
+            page_ratio = pm.width / pm.height
+            canvas_ratio = canvas_width / canvas_height
+
+            if page_ratio > canvas_ratio:
+                target_size = (canvas_width, max(1, int(canvas_width / page_ratio)))
+            else:
+                target_size = (max(1, int(canvas_height * page_ratio)), canvas_height)
 
-                image = image.resize((new_width, new_height), Image.LANCZOS)
+        # Skip rasterization when neither the SVG nor the display size changed
+        svg_hash = hash((svg_bytes, target_size))
+        if svg_hash == self._last_svg_hash:
+            return self._last_png_image
 
-            # Convert PIL image to Tkinter PhotoImage
-            self.img = ImageTk.PhotoImage(image)
-
-            # Display image in canvas
-            self.canvas.create_image(
-                canvas_width // 2, canvas_height // 2,
-                image=self.img,
-                anchor=tk.CENTER
-            )
-            
-            # Update status
-            self.status_var.set(f"Preview of {pattern_type} pattern ({columns}×{rows})")
+        # Convert SVG to PNG in memory using cairosvg
+        if target_size is not None:
+            png_data = cairosvg.svg2png(bytestring=svg_bytes,
+                                        output_width=target_size[0], output_height=target_size[1])
+        else:
+            png_data = cairosvg.svg2png(bytestring=svg_bytes)
+
+        # Load image from PNG data
+        image = Image.open(io.BytesIO(png_data))
+        # Image.open is lazy; decode here so PhotoImage does not do it on the Tk thread
+        image.load()
+
+        # Only shrinks, so this is a no-op when cairosvg already rendered to fit
+        if target_size is not None:
+            image.thumbnail((canvas_width, canvas_height), Image.BILINEAR)
+
+        self._last_svg_hash = svg_hash
+        self._last_png_image = image
+        return image
+
+    def _show_preview(self, gen_id, future, pattern_type, columns, rows, canvas_width, canvas_height):
+        if gen_id != self._gen_id:
+            return  # A newer preview has been requested
+        if not future.done():
+            # Poll from the main thread: Tk calls are not safe from the worker
+            self.root.after(10, self._show_preview, gen_id, future, pattern_type, columns, rows,
+                            canvas_width, canvas_height)
+            return
 
+        try:
+            image = future.result()
         except Exception as e:
             self.status_var.set(f"Error: {str(e)}")
             messagebox.showerror("Error", f"Failed to generate preview: {str(e)}")
+            return
+
+        # Clear canvas
+        self.canvas.delete("all")
+
+        # Convert PIL image to Tkinter PhotoImage, reusing the current one if unchanged
+        if image is not self._shown_image:
+            self.img = ImageTk.PhotoImage(image)
+            self._shown_image = image
+
+        # Display image in canvas
+        self.canvas.create_image(
+            canvas_width // 2, canvas_height // 2,
+            image=self.img,
+            anchor=tk.CENTER
+        )
+        
+        # Update status
+        self.status_var.set(f"Preview of {pattern_type} pattern ({columns}×{rows})")
 
     def save_pattern(self):
         try:
@@ -671,17 +810,7 @@ class PatternMakerGUI:
             )
 
             # Generate the pattern
-            pattern_methods = {
-                "circles": pm.make_circles_pattern,
-                "acircles": pm.make_acircles_pattern,
-                "checkerboard": pm.make_checkerboard_pattern,
-                "radon_checkerboard": pm.make_radon_checkerboard_pattern
-            }
-
-            if pattern_type == "charuco_board":
-                pm.make_charuco_board()
-            else:
-                pattern_methods[pattern_type]()
+            pm.make_pattern(pattern_type)
 
             # Save the pattern
             pm.save()
@@ -694,55 +823,58 @@ class PatternMakerGUI:
             messagebox.showerror("Error", f"Failed to save pattern: {str(e)}")
 
 
+# Default A4 page size per CLI length unit
+DEFAULT_PAGE = {"mm": (210, 297), "px": (595, 842), "in": (8.27, 11.7)}
+
+
+@functools.cache
+def _build_parser():
+    parser = argparse.ArgumentParser(description="generate camera-calibration pattern")
+    parser.add_argument("-o", "--output", help="output file", default="out.svg", action="store", dest="output")
+    parser.add_argument("-c", "--columns", help="pattern columns", default="8", action="store", dest="columns", type=int)
+    parser.add_argument("-r", "--rows", help="pattern rows", default="11", action="store", dest="rows", type=int)
+    parser.add_argument("-T", "--type", help="type of pattern", default="circles", action="store", dest="p_type",
+                        choices=["circles", "acircles", "checkerboard", "radon_checkerboard"])
+    parser.add_argument("-u", "--units", help="length unit", default="mm", action="store", dest="units",
+                        choices=["mm", "px"])
+    parser.add_argument("-s", "--square_size", help="size of squares in pattern", default="20.0", action="store",
+                        dest="square_size", type=float)
+    parser.add_argument("-R", "--radius_rate", help="circles_radius = square_size/radius_rate", default="5.0",
+                        action="store", dest="radius_rate", type=float)
+    parser.add_argument("-w", "--page_width", help="page width in units", default=argparse.SUPPRESS, action="store",
+                        dest="page_width", type=float)
+    parser.add_argument("-H", "--page_height", help="page height in units", default=argparse.SUPPRESS, action="store",
+                        dest="page_height", type=float)
+    parser.add_argument("-a", "--aruco_marker_size", help="aruco marker size", default="10.0", action="store",
+                        dest="aruco_marker_size", type=float)
+    parser.add_argument("-d", "--dict_file", help="aruco dictionary file", default="DICT_ARUCO_ORIGINAL.json",
+                        action="store", dest="dict_file")
+    parser.add_argument("-m", "--markers", help="list of markers as 'x,y;x,y;...'", default=None,
+                        action="store", dest="markers")
+    return parser
+
+
 def main():
     # Check if command-line arguments are provided
     if len(sys.argv) > 1:
         # Parse command line options
-        parser = argparse.ArgumentParser(description="generate camera-calibration pattern")
-        parser.add_argument("-o", "--output", help="output file", default="out.svg", action="store", dest="output")
-        parser.add_argument("-c", "--columns", help="pattern columns", default="8", action="store", dest="columns", type=int)
-        parser.add_argument("-r", "--rows", help="pattern rows", default="11", action="store", dest="rows", type=int)
-        parser.add_argument("-T", "--type", help="type of pattern", default="circles", action="store", dest="p_type",
-                            choices=["circles", "acircles", "checkerboard", "radon_checkerboard"])
-        parser.add_argument("-u", "--units", help="length unit", default="mm", action="store", dest="units",
-                            choices=["mm", "px"])
-        parser.add_argument("-s", "--square_size", help="size of squares in pattern", default="20.0", action="store",
-                            dest="square_size", type=float)
-        parser.add_argument("-R", "--radius_rate", help="circles_radius = square_size/radius_rate", default="5.0",
-                            action="store", dest="radius_rate", type=float)
-        parser.add_argument("-w", "--page_width", help="page width in units", default=argparse.SUPPRESS, action="store",
-                            dest="page_width", type=float)
-        parser.add_argument("-H", "--page_height", help="page height in units", default=argparse.SUPPRESS, action="store",
-                            dest="page_height", type=float)
-        parser.add_argument("-a", "--aruco_marker_size", help="aruco marker size", default="10.0", action="store",
-                            dest="aruco_marker_size", type=float)
-        parser.add_argument("-d", "--dict_file", help="aruco dictionary file", default="DICT_ARUCO_ORIGINAL.json",
-                            action="store", dest="dict_file")
-        parser.add_argument("-m", "--markers", help="list of markers as 'x,y;x,y;...'", default=None,
-                            action="store", dest="markers")
-
-        args = parser.parse_args()
+        args = _build_parser().parse_args()
 
         # Process markers if provided
         markers = None
         if args.markers:
-            markers = []
-            for marker in args.markers.split(';'):
-                x, y = marker.split(',')
-                markers.append((int(x), int(y)))
-
-        # Set default page size if not specified
-        if not hasattr(args, 'page_width') or not hasattr(args, 'page_height'):
-            # Default to A4 in mm
-            if args.units == "mm":
-                args.page_width = 210 if not hasattr(args, 'page_width') else args.page_width
-                args.page_height = 297 if not hasattr(args, 'page_height') else args.page_height
-            elif args.units == "in":
-                args.page_width = 8.27 if not hasattr(args, 'page_width') else args.page_width
-                args.page_height = 11.7 if not hasattr(args, 'page_height') else args.page_height
-            else:
-                args.page_width = 595 if not hasattr(args, 'page_width') else args.page_width
-                args.page_height = 842 if not hasattr(args, 'page_height') else args.page_height
+            # One (x, y) row per marker, parsed in C rather than with per-pair int() calls
+            pairs = args.markers.split(';')
+            markers = np.fromstring(args.markers.replace(';', ','), sep=',', dtype=np.int32)
+            # NumPy 1.x stops at the first bad field with only a DeprecationWarning
+            if any(pair.count(',') != 1 for pair in pairs) or markers.size != 2 * len(pairs):
+                raise ValueError(f"invalid markers: {args.markers!r}, expected 'x1,y1;x2,y2;...'")
+            markers = markers.reshape(-1, 2)
+
+        # Set default page size (A4) if not specified
+        default_width, default_height = DEFAULT_PAGE[args.units]
+        args.page_width = getattr(args, 'page_width', default_width)
+        args.page_height = getattr(args, 'page_height', default_height)
 
         # Create pattern maker
         pm = PatternMaker(
@@ -760,14 +892,7 @@ def main():
         )
 
         # Generate pattern based on type
-        if args.p_type == "circles":
-            pm.make_circles_pattern()
-        elif args.p_type == "acircles":
-            pm.make_acircles_pattern()
-        elif args.p_type == "checkerboard":
-            pm.make_checkerboard_pattern()
-        elif args.p_type == "radon_checkerboard":
-            pm.make_radon_checkerboard_pattern()
+        pm.make_pattern(args.p_type)
 
         # Save the pattern
         pm.save()
@@ -4,23 +4,48 @@ requirment.py
 A script to check for required packages for the camera calibration pattern project.
 """
 
-import importlib
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from importlib.util import find_spec
 import sys
 
 dependencies = {
     "numpy": "numpy",
     "Pillow": "PIL",
-    "cairosvg": "cairosvg",
-    "svgwrite": "svgwrite"
+    "cairosvg": "cairosvg"
 }
 
+# Packages that load a native library on import; locating them is not enough
+native_dependencies = {"cairosvg"}
+
+def _check_one(item):
+    # Returns (pkg_name, found, error); error is set when the package is present
+    # but its native library failed to load
+    pkg_name, module_name = item
+    if pkg_name in native_dependencies:
+        # A missing libcairo only shows up when the module is actually imported
+        try:
+            import_module(module_name)
+        except ImportError:
+            return pkg_name, False, None
+        except OSError as e:
+            return pkg_name, True, e
+        return pkg_name, True, None
+    # Only locate the module; these wheels bundle their native code, so a full import adds nothing
+    return pkg_name, find_spec(module_name) is not None, None
+
 def check_dependencies():
     missing = []
-    for pkg_name, module_name in dependencies.items():
-        try:
-            importlib.import_module(module_name)
+    # The lookups are independent and mostly filesystem-bound, so run them concurrently
+    with ThreadPoolExecutor(max_workers=len(dependencies)) as ex:
+        results = list(ex.map(_check_one, dependencies.items()))
+    for pkg_name, found, error in results:
+        if error is not None:
+            print(f"{pkg_name} is installed but its cairo library could not be loaded: {error}")
+            missing.append(pkg_name)
+        elif found:
             print(f"{pkg_name} is installed.")
-        except ImportError:
+        else:
             print(f"{pkg_name} is missing. Please install it using pip.")
             missing.append(pkg_name)
     if missing: